@@ -57,6 +57,9 @@ class FSTNode():
         self._children = {}
         self._id = nodeid
 
+        # path cache, cleared when the node is moved
+        self._cachedPath = None
+
         # setup
         self.parent = parent
 
@@ -100,14 +103,22 @@ class FSTNode():
 
     @property
     def path(self) -> str:
-        path = self.name
-        parent = self.parent
-        while parent is not None:
-            if parent.is_root():
-                break
-            path = f"{parent.name}/{path}"
-            parent = parent.parent
-        return path
+        if self._cachedPath is None:
+            # Climb to the nearest cached ancestor, then fill paths on the way down
+            uncached = [self]
+            parent = self.parent
+            while parent is not None and not parent.is_root() and parent._cachedPath is None:
+                uncached.append(parent)
+                parent = parent.parent
+
+            prefix = None
+            if parent is not None and not parent.is_root():
+                prefix = parent._cachedPath
+
+            for node in reversed(uncached):
+                node._cachedPath = node.name if prefix is None else f"{prefix}/{node.name}"
+                prefix = node._cachedPath
+        return self._cachedPath
 
     @property
     def dirs(self) -> FSTNode:
@@ -122,31 +133,28 @@ class FSTNode():
                 yield node
 
     def rdirs(self, includedOnly: bool = False) -> Iterator[FSTNode]:
-        for node in self.children:
-            if includedOnly and node._exclude:
-                continue
-
+        for node in self.rchildren(includedOnly=includedOnly):
             if node.is_dir():
                 yield node
-                yield from node.rdirs(includedOnly=includedOnly)
 
     def rfiles(self, includedOnly: bool = False) -> Iterator[FSTNode]:
-        for node in self.children:
-            if includedOnly and node._exclude:
-                continue
-
+        for node in self.rchildren(includedOnly=includedOnly):
             if node.is_file():
                 yield node
-            else:
-                yield from node.rfiles(includedOnly=includedOnly)
 
     def rchildren(self, includedOnly: bool = False) -> Iterator[FSTNode]:
-        for node in self.children:
-            if includedOnly and node._exclude:
-                continue
+        stack = [self.children]
+        while stack:
+            for node in stack[-1]:
+                if includedOnly and node._exclude:
+                    continue
 
-            yield node
-            yield from node.rchildren(includedOnly=includedOnly)
+                yield node
+                if node.is_dir():
+                    stack.append(node.children)
+                    break
+            else:
+                stack.pop()
 
     @property
     def parent(self) -> FSTNode:
@@ -165,6 +173,7 @@ class FSTNode():
             node._children[self.name] = self
 
         self._parent = node
+        self._clear_cached_path()
 
     @property
     def children(self) -> Iterator[FSTNode]:
@@ -224,6 +233,18 @@ class FSTNode():
         self._children.pop(node.name)
         node.parent = None
 
+    def _clear_cached_path(self):
+        self._cachedPath = None
+
+        # A cached child path implies a cached parent path below the root,
+        # so uncached branches can be skipped
+        stack = list(self._children.values())
+        while stack:
+            node = stack.pop()
+            if node._cachedPath is not None:
+                node._cachedPath = None
+                stack.extend(node._children.values())
+
     def num_children(self, skipExcluded: bool = True) -> int:
         return len(list(self.rchildren(includedOnly=skipExcluded)))
 
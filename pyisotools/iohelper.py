@@ -1,8 +1,17 @@
+import mmap
+import os
 import struct
+import threading
+from pathlib import Path
 from typing import BinaryIO, Optional
 
 from chardet import UniversalDetector
 
+_CAN_COPY_RANGE = hasattr(os, "copy_file_range")
+_CAN_PREAD = hasattr(os, "pread")
+_CAN_PWRITE = hasattr(os, "pwrite")
+_SEEK_LOCK = threading.Lock()
+
 
 def read_sbyte(f: BinaryIO):
     return struct.unpack("b", f.read(1))[0]
@@ -126,3 +135,86 @@ def detect_encoding(string: bytes) -> str:
 
 def align_int(num: int, alignment: int) -> int:
     return (num + (alignment - 1)) & -alignment
+
+
+def write_file_at(fd: int, src: Path, offset: int) -> int:
+    """
+    Copies the contents of `src` to `offset` of the file descriptor `fd` without
+    buffering it in Python, returning the amount of bytes copied
+
+    Where positional IO is available the position of `fd` is left untouched,
+    so concurrent calls on the same descriptor are safe
+    """
+    with src.open("rb") as data:
+        if _CAN_COPY_RANGE:
+            copied = 0
+            try:
+                while True:
+                    sent = os.copy_file_range(
+                        data.fileno(), fd, 0x40000000, copied, offset + copied)
+                    if sent == 0:
+                        return copied
+                    copied += sent
+            except OSError:
+                if copied > 0:
+                    raise
+
+        # Map larger files so their pages go straight from the page cache to `fd`
+        if os.fstat(data.fileno()).st_size < 0x10000:
+            return _write_all_at(fd, data.read(), offset)
+
+        with mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            return _write_all_at(fd, mapping, offset)
+
+
+def read_file_at(fd: int, dest: Path, offset: int, size: int) -> int:
+    """
+    Copies `size` bytes from `offset` of the file descriptor `fd` into `dest` in
+    bounded chunks, returning the amount of bytes copied
+
+    Where positional IO is available the position of `fd` is left untouched,
+    so concurrent calls on the same descriptor are safe
+    """
+    with dest.open("wb") as out:
+        copied = 0
+        if _CAN_COPY_RANGE:
+            try:
+                while copied < size:
+                    sent = os.copy_file_range(
+                        fd, out.fileno(), min(size - copied, 0x40000000), offset + copied)
+                    if sent == 0:
+                        return copied
+                    copied += sent
+                return copied
+            except OSError:
+                if copied > 0:
+                    raise
+
+        while copied < size:
+            length = min(size - copied, 0x100000)
+            if _CAN_PREAD:
+                chunk = os.pread(fd, length, offset + copied)
+            else:
+                with _SEEK_LOCK:
+                    os.lseek(fd, offset + copied, os.SEEK_SET)
+                    chunk = os.read(fd, length)
+            if not chunk:
+                break
+            out.write(chunk)
+            copied += len(chunk)
+        return copied
+
+
+def _write_all_at(fd: int, data, offset: int) -> int:
+    with memoryview(data) as view:
+        written = 0
+        if _CAN_PWRITE:
+            while written < len(view):
+                written += os.pwrite(fd, view[written:], offset + written)
+            return written
+
+        with _SEEK_LOCK:
+            os.lseek(fd, offset, os.SEEK_SET)
+            while written < len(view):
+                written += os.write(fd, view[written:])
+        return written
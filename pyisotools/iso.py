@@ -1,21 +1,214 @@
 from __future__ import annotations
 
 import json
-from fnmatch import fnmatch
+import os
+import re
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch, translate
+from itertools import accumulate, repeat
 from io import BytesIO
 from pathlib import Path
 from typing import BinaryIO, Callable, Optional, Union
 
 from dolreader.dol import DolFile
-from sortedcontainers import SortedDict, SortedList
+from sortedcontainers import SortedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from pyisotools.apploader import Apploader
 from pyisotools.bi2 import BI2
 from pyisotools.bnrparser import BNR
 from pyisotools.boot import Boot
 from pyisotools.fst import FST, FSTNode, InvalidEntryError, InvalidFSTError
-from pyisotools.iohelper import (align_int, read_string, read_ubyte,
-                                 read_uint32, write_uint32)
+from pyisotools.iohelper import (align_int, detect_encoding, read_file_at,
+                                 write_file_at, write_uint32)
+
+_FST_ENTRY = struct.Struct(">III")
+_IO_WORKERS = 8
+_WILDCARDS = re.compile(r"[*?[]")
+
+
+def _normalize_glob(pattern: str) -> str:
+    return re.sub(r"\*+", "*", os.path.normcase(pattern.strip()))
+
+
+def _read_json(path: Path):
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: Path, data):
+    # orjson only supports 2 space indentation, match it so output is identical
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _compile_globs(patterns) -> Optional[re.Pattern]:
+    """
+    Compiles a collection of glob patterns into a single alternation regex
+
+    Each pattern is captured by a group named `_entry<index>`, so the match's
+    `lastgroup` identifies the first pattern (in iteration order) that matched
+    """
+    groups = []
+    for i, pattern in enumerate(patterns):
+        groups.append(f"(?P<_entry{i}>{translate(_normalize_glob(pattern))})")
+
+    if not groups:
+        return None
+    return re.compile("|".join(groups))
+
+
+def _glob_index(match: re.Match) -> int:
+    return int(match.lastgroup[6:])
+
+
+class _GlobTrie():
+    """
+    Character trie over the literal (wildcard free) prefix of glob patterns
+
+    Each pattern is stored at the node reached by its literal prefix, keeping only
+    the remaining glob. A lookup walks the trie along the path and only tests the
+    remainders found on the way, so unrelated patterns are never looked at
+    """
+
+    _GLOBS = ""
+
+    def __init__(self, table: dict):
+        """
+        table: Mapping of glob pattern to value, earlier entries take priority
+        """
+        self._root = {}
+
+        pending = []
+        for i, (pattern, value) in enumerate(table.items()):
+            pattern = _normalize_glob(pattern)
+            wildcard = _WILDCARDS.search(pattern)
+            split = wildcard.start() if wildcard else len(pattern)
+
+            node = self._root
+            for char in pattern[:split]:
+                node = node.setdefault(char, {})
+
+            if _GlobTrie._GLOBS not in node:
+                node[_GlobTrie._GLOBS] = ([], [])
+                pending.append(node)
+            node[_GlobTrie._GLOBS][0].append(pattern[split:])
+            node[_GlobTrie._GLOBS][1].append((i, value))
+
+        for node in pending:
+            globs, entries = node[_GlobTrie._GLOBS]
+            node[_GlobTrie._GLOBS] = (_compile_globs(globs), entries)
+
+    def match(self, path: str):
+        """
+        Returns the value of the highest priority pattern matching `path`, or None
+        """
+        bestIndex = -1
+        bestValue = None
+        node = self._root
+        for i in range(len(path) + 1):
+            globs = node.get(_GlobTrie._GLOBS)
+            if globs is not None:
+                match = globs[0].match(path, i)
+                if match is not None:
+                    index, value = globs[1][_glob_index(match)]
+                    if bestIndex < 0 or index < bestIndex:
+                        bestIndex = index
+                        bestValue = value
+
+            if i == len(path):
+                break
+
+            node = node.get(path[i])
+            if node is None:
+                break
+
+        return bestValue
+
+    def matches(self, path: str) -> bool:
+        """
+        Returns True if any pattern matches `path`, stopping at the first match
+        """
+        node = self._root
+        for i in range(len(path) + 1):
+            globs = node.get(_GlobTrie._GLOBS)
+            if globs is not None and globs[0].match(path, i) is not None:
+                return True
+
+            if i == len(path):
+                break
+
+            node = node.get(path[i])
+            if node is None:
+                break
+
+        return False
+
+
+def _encode_name(name: str) -> bytes:
+    """ Encodes an FST name as Shift-JIS, the disc encoding, falling back to UTF-8 """
+    try:
+        return name.encode("shift-jis")
+    except UnicodeEncodeError:
+        return name.encode("utf-8")
+
+
+def _build_string_table(names: list) -> tuple:
+    """
+    Encodes `names` into a null terminated FST string table,
+    returning the table and the offset of each name within it
+    """
+    if not names:
+        return b"", []
+
+    table = "\x00".join(names) + "\x00"
+    if table.isascii():
+        # Byte lengths match character lengths, so a single encode suffices
+        lengths = [len(name) + 1 for name in names]
+        table = table.encode("ascii")
+    else:
+        encoded = [_encode_name(name) + b"\x00" for name in names]
+        lengths = [len(name) for name in encoded]
+        table = b"".join(encoded)
+
+    offsets = list(accumulate(lengths[:-1], initial=0))
+
+    # Name offsets share an entry word with the node type, leaving them 24 bits
+    if offsets[-1] > 0xFFFFFF:
+        raise InvalidFSTError(
+            f"FST name offset 0x{offsets[-1]:X} exceeds the 24 bit limit of 0xFFFFFF")
+
+    return table, offsets
+
+
+def _split_globs(table: dict) -> tuple:
+    """
+    Separates the wildcard free entries of `table` into a dict for direct lookup,
+    returning that dict and a `_GlobTrie` of the remaining entries (or None)
+    """
+    literals = {}
+    globs = {}
+    for pattern, value in table.items():
+        normalized = _normalize_glob(pattern)
+        if _WILDCARDS.search(normalized):
+            globs[pattern] = value
+        else:
+            literals.setdefault(normalized, value)
+
+    return literals, _GlobTrie(globs) if globs else None
 
 
 class FileSystemTooLargeError(Exception):
@@ -66,7 +259,12 @@ class ISOBase(_ISOInfo):
 
         self._alignmentTable = SortedDict()
         self._locationTable = SortedDict()
-        self._excludeTable = SortedList()
+        self._excludeTable = []
+
+        self._alignmentLiterals = {}
+        self._alignmentTrie: Optional[_GlobTrie] = None
+        self._excludeLiterals = {}
+        self._excludeTrie: Optional[_GlobTrie] = None
 
     # pylint: disable=unused-argument
     @staticmethod
@@ -154,78 +352,78 @@ class ISOBase(_ISOInfo):
     def onVirtualJobEnd(self, callback: Callable[[], None]):
         self._onVirtualJobEnd = callback
 
-    def _read_nodes(self, fst, node: FSTNode, strTabOfs: int) -> FSTNode:
-        _type = read_ubyte(fst)
-        _nameOfs = int.from_bytes(fst.read(3), "big", signed=False)
-        _entryOfs = read_uint32(fst)
-        _size = read_uint32(fst)
-
-        _oldpos = fst.tell()
-        node.name = read_string(fst, strTabOfs + _nameOfs)
-        fst.seek(_oldpos)
-
-        node._id = self._curEntry
-
-        self._curEntry += 1
-
-        if _type == FSTNode.FOLDER:
-            node.type = FSTNode.FOLDER
-            node._dirparent = _entryOfs
-            node._dirnext = _size
-
-            while self._curEntry < _size:
-                child = self._read_nodes(fst, FSTNode.empty(), strTabOfs)
-                node.add_child(child)
-        else:
-            node.type = FSTNode.FILE
-            node.size = _size
-            node._fileoffset = _entryOfs
-
-        return node
-
     def _init_tables(self, config: Optional[dict] = None):
         if not config:
             self._alignmentTable = SortedDict()
             self._locationTable = SortedDict()
-            self._excludeTable = SortedList()
+            self._excludeTable = []
         elif isinstance(config, dict):
             self._alignmentTable = SortedDict(config["alignment"])
             self._locationTable = SortedDict(config["location"])
-            self._excludeTable = SortedList(config["exclude"])
+            self._excludeTable = list(config["exclude"])
         else:
-            with config.open("r") as f:
-                data = json.load(f)
+            data = _read_json(config)
             self._alignmentTable = SortedDict(data["alignment"])
             self._locationTable = SortedDict(data["location"])
-            self._excludeTable = SortedList(data["exclude"])
+            self._excludeTable = list(data["exclude"])
 
-    def _recursive_extract(self, node: FSTNode, dest: Path, iso: BinaryIO, dumpPositions: bool = False):
-        if node.is_file():
-            self.onPhysicalTaskStart(node.path, node.size)
-            iso.seek(node._fileoffset)
-            dest.write_bytes(iso.read(node.size))
-            self.onPhysicalTaskComplete()
-        else:
-            dest.mkdir(parents=True, exist_ok=True)
-            for child in node.children:
-                self._recursive_extract(child, dest/child.name, iso)
+        self._compile_tables()
+
+    def _compile_tables(self):
+        """
+        Rebuilds the compiled path matchers, must be called whenever
+        the alignment or exclude tables change
+        """
+        self._alignmentLiterals, self._alignmentTrie = _split_globs(
+            self._alignmentTable)
+        self._excludeLiterals, self._excludeTrie = _split_globs(
+            dict.fromkeys(self._excludeTable, True))
+
+    def _extract_node(self, node: FSTNode, dest: Path, dumpPositions: bool = False):
+        files = []
+        dests = []
+        stack = deque([(node, dest)])
+        while stack:
+            _node, _dest = stack.pop()
+            if _node.is_file():
+                files.append(_node)
+                dests.append(_dest)
+            else:
+                _dest.mkdir(parents=True, exist_ok=True)
+                stack.extend((child, _dest/child.name)
+                             for child in reversed(list(_node.children)))
+
+        with self.isoPath.open("rb") as iso, ThreadPoolExecutor(_IO_WORKERS) as pool:
+            for _node in pool.map(self._extract_file, repeat(iso.fileno()), files, dests):
+                self.onPhysicalTaskStart(_node.path, _node.size)
+                self.onPhysicalTaskComplete()
 
         if dumpPositions:
             self._locationTable[node.path] = node._fileoffset
 
-    def _collect_size(self, size: int) -> int:
-        for node in self.children:
-            if self._get_excluded(node) is True or self._get_location(node) is not None:
-                continue
+    @staticmethod
+    def _extract_file(fd: int, node: FSTNode, dest: Path) -> FSTNode:
+        read_file_at(fd, dest, node._fileoffset, node.size)
+        return node
 
-            if node.is_file():
-                alignment = self._get_alignment(node)
-                size = align_int(size, alignment)
-                size += node.size
-            else:
-                size = node._collect_size(size)
+    def _apply_tables(self, node: FSTNode) -> int:
+        """
+        Assigns the table alignment and location to every file under `node`,
+        returning the auto blob size of those files
 
-        return align_int(size, 4)
+        Nodes cache these values, so the tables are only consulted once per node
+        """
+        _size = 0
+        for child in node.rchildren():
+            if child.is_file():
+                child._alignment = self._get_alignment(child)
+                child._position = self._get_location(child)
+
+                # Only files are excluded while loading, see `_load_from_path`
+                if not child._exclude and not child._position:
+                    _size = align_int(_size, child._alignment) + child.size
+
+        return align_int(_size, 0x8000)
 
     def _get_greatest_alignment(self) -> int:
         try:
@@ -239,16 +437,15 @@ class ISOBase(_ISOInfo):
         else:
             _path = node
 
-        alignment = 4
-        if self._alignmentTable is None:
-            return alignment
+        _path = os.path.normcase(_path)
+        width = self._alignmentLiterals.get(_path)
+        if width is None and self._alignmentTrie is not None:
+            width = self._alignmentTrie.match(_path)
 
-        for entry, width in self._alignmentTable.items():
-            if fnmatch(_path, entry.strip()):
-                alignment = max(min(width, 32768), 4)
-                break
+        if width is None:
+            return 4
 
-        return alignment
+        return max(min(width, 32768), 4)
 
     def _get_location(self, node: Union[FSTNode, str]) -> int:
         if isinstance(node, FSTNode):
@@ -266,11 +463,15 @@ class ISOBase(_ISOInfo):
         else:
             _path = node
 
-        if self._excludeTable:
-            for entry in self._excludeTable:
-                if fnmatch(_path, entry.strip()):
-                    return True
-        return False
+        if not self._excludeTable:
+            return False
+
+        _path = os.path.normcase(_path)
+        if _path in self._excludeLiterals:
+            return True
+        if self._excludeTrie is None:
+            return False
+        return self._excludeTrie.matches(_path)
 
 
 class WiiISO(ISOBase):
@@ -344,6 +545,9 @@ class GamecubeISO(ISOBase):
             return "&&systemdata" in folders
         return False
 
+    def _write_file(self, fd: int, node: FSTNode) -> tuple:
+        return node, write_file_at(fd, self.dataPath / node.path, node._fileoffset)
+
     def build(self, dest: Union[Path, str] = None, preCalc: bool = True):
         if dest is not None:
             fmtpath = str(dest).replace(
@@ -365,33 +569,43 @@ class GamecubeISO(ISOBase):
             self.pre_calc_metadata(
                 (self.MaxSize - self.get_auto_blob_size()) & -self._get_greatest_alignment())
 
-        self._rawFST.seek(0)
-        self._rawFST.write(b"\x01\x00\x00\x00\x00\x00\x00\x00")
-        write_uint32(self._rawFST, len(self))
+        nodes = list(self.rchildren(includedOnly=True))
+        strTable, nameOffsets = _build_string_table(
+            [node.name for node in nodes])
+        entries = bytearray()
+
+        # Folder entries are completed once the walk leaves them,
+        # as their end index is the next entry outside the folder
+        folders = []
 
         _curEntry = 1
-        _strOfs = 0
-        _strTableOfs = self.strTableOfs
-        for child in self.rchildren(includedOnly=True):
+        for child, _strOfs in zip(nodes, nameOffsets):
             self.onVirtualTaskStart(child.path, len(child.name) + 13)
 
+            while folders and folders[-1][0] is not child.parent:
+                _, _entryOfs, _info, _parentID = folders.pop()
+                _FST_ENTRY.pack_into(entries, _entryOfs, _info, _parentID, _curEntry)
+
             child._id = _curEntry
-            self._rawFST.write(b"\x01" if child.is_dir() else b"\x00")
-            self._rawFST.write((_strOfs).to_bytes(3, "big", signed=False))
-            write_uint32(
-                self._rawFST, child.parent._id if child.is_dir() else child._fileoffset)
-            write_uint32(self._rawFST, len(child) +
-                         _curEntry if child.is_dir() else child.size)
+            if child.is_dir():
+                folders.append((child, len(entries), 0x1000000 | _strOfs, child.parent._id))
+                entries += bytes(_FST_ENTRY.size)
+            else:
+                entries += _FST_ENTRY.pack(_strOfs, child._fileoffset, child.size)
             _curEntry += 1
 
-            _oldpos = self._rawFST.tell()
-            self._rawFST.seek(_strOfs + _strTableOfs)
-            self._rawFST.write(child.name.encode() + b"\x00")
-            _strOfs += len(child.name) + 1
-            self._rawFST.seek(_oldpos)
-
             self.onVirtualTaskComplete()
 
+        for _, _entryOfs, _info, _parentID in folders:
+            _FST_ENTRY.pack_into(entries, _entryOfs, _info, _parentID, _curEntry)
+
+        self._rawFST.seek(0)
+        self._rawFST.write(b"\x01\x00\x00\x00\x00\x00\x00\x00")
+        write_uint32(self._rawFST, _curEntry)
+        self._rawFST.write(entries)
+        self._rawFST.write(strTable)
+        self._rawFST.truncate()
+
         self.bootheader.fstSize = len(self._rawFST.getbuffer())
         self.bootheader.fstMaxSize = self.bootheader.fstSize
 
@@ -454,30 +668,32 @@ class GamecubeISO(ISOBase):
             self.onVirtualTaskComplete()
 
             self.onVirtualTaskStart("main.dol", self.dol.size)
-            f.write(b"\x00" * (self.bootheader.dolOffset - f.tell()))
             self.dol.save(f, self.bootheader.dolOffset)
             self.onVirtualTaskComplete()
 
             self.onVirtualTaskStart(
                 "FST Padding", (self.bootheader.fstOffset - f.tell()))
-            f.seek(f.tell() + self.dol.size)
-            f.write(b"\x00" * (self.bootheader.fstOffset - f.tell()))
+            f.seek(self.bootheader.fstOffset)
             self.onVirtualTaskComplete()
 
             self.onVirtualTaskStart("fst.bin", len(self._rawFST.getbuffer()))
             f.write(self._rawFST.getvalue())
             self.onVirtualTaskComplete()
 
-            for child in self.rfiles(includedOnly=True):
-                self.onVirtualTaskStart(child.path, child.size)
-                f.write(b"\x00" * (child._fileoffset - f.tell()))
-                f.seek(child._fileoffset)
-                f.write((self.dataPath / child.path).read_bytes())
-                f.seek(0, 2)
-                self.onVirtualTaskComplete()
-
-            self.onVirtualTaskStart("Padding", (self.MaxSize - f.tell()))
-            f.write(b"\x00" * (self.MaxSize - f.tell()))
+            # Files are written at their offsets without moving the shared position
+            f.flush()
+            _end = f.tell()
+            with ThreadPoolExecutor(_IO_WORKERS) as pool:
+                for child, copied in pool.map(self._write_file, repeat(f.fileno()),
+                                              self.rfiles(includedOnly=True)):
+                    self.onVirtualTaskStart(child.path, child.size)
+                    _end = max(_end, child._fileoffset + copied)
+                    self.onVirtualTaskComplete()
+
+            # Gaps are left as holes, the filesystem zero fills them
+            self.onVirtualTaskStart("Padding", (self.MaxSize - _end))
+            if _end < self.MaxSize:
+                f.truncate(self.MaxSize)
 
         # ----------- #
 
@@ -715,6 +931,8 @@ class GamecubeISO(ISOBase):
                 self._alignmentTable[node.path] = alignment
             prev = node
 
+        self._compile_tables()
+
     def init_from_root(self, root: Path, genNewInfo: bool = False):
         self.root = root
 
@@ -792,9 +1010,7 @@ class GamecubeISO(ISOBase):
         jobSize = node.datasize
         self.onPhysicalJobStart("(Files)", jobSize)
 
-        with self.isoPath.open("rb") as _rawISO:
-            self._recursive_extract(
-                node, dest / node.name, _rawISO, dumpPositions)
+        self._extract_node(node, dest / node.name, dumpPositions)
 
         self.onPhysicalJobEnd()
 
@@ -872,8 +1088,16 @@ class GamecubeISO(ISOBase):
             ignoreList.extend(self._excludeTable)
 
         self._load_from_path(path, parentnode, ignoreList)
+        if parentnode is self:
+            blobSize = self._apply_tables(self)
+        else:
+            if parentnode is not None:
+                self._apply_tables(parentnode)
+            # Only a full load covers every file counted by the blob size
+            blobSize = self.get_auto_blob_size()
+
         self.pre_calc_metadata(
-            (self.MaxSize - self.get_auto_blob_size()) & -self._get_greatest_alignment())
+            (self.MaxSize - blobSize) & -self._get_greatest_alignment())
 
     def load_file_systemv(self, fst: BinaryIO):
         """
@@ -882,57 +1106,83 @@ class GamecubeISO(ISOBase):
             fst: BytesIO or opened file object containing the FST of an ISO
         """
 
-        if fst.read(1) != b"\x01":
+        rootEntry = fst.read(_FST_ENTRY.size)
+        if len(rootEntry) != _FST_ENTRY.size:
+            raise InvalidFSTError("Truncated Root entry found")
+
+        _info, _entryOfs, entryCount = _FST_ENTRY.unpack(rootEntry)
+        if _info >> 24 != FSTNode.FOLDER:
             raise InvalidFSTError("Invalid Root flag found")
-        if fst.read(3) != b"\x00\x00\x00":
+        if _info & 0xFFFFFF != 0:
             raise InvalidFSTError("Invalid Root string offset found")
-        if fst.read(4) != b"\x00\x00\x00\x00":
+        if _entryOfs != 0:
             raise InvalidFSTError("Invalid Root offset found")
 
         self._alignmentTable = SortedDict()
-        entryCount = read_uint32(fst)
+        self._compile_tables()
+        entries = fst.read(max(entryCount - 1, 0) * _FST_ENTRY.size)
+        strTable = fst.read()
+
+        # Folders own every entry up to their end index, track the open ones
+        folders = [(self, entryCount)]
+        for _id, (_info, _entryOfs, _size) in enumerate(_FST_ENTRY.iter_unpack(entries), 1):
+            while _id >= folders[-1][1]:
+                folders.pop()
+
+            _nameOfs = _info & 0xFFFFFF
+            _nameEnd = strTable.find(b"\x00", _nameOfs)
+            _name = strTable[_nameOfs:_nameEnd if _nameEnd != -1 else None]
+            if _name.isascii():
+                _name = _name.decode("ascii")
+            else:
+                _name = detect_encoding(_name)
+
+            if _info >> 24 == FSTNode.FOLDER:
+                node = FSTNode.folder(_name)
+                node._dirnext = _size
+            else:
+                node = FSTNode.file(_name, size=_size, offset=_entryOfs)
 
-        self._curEntry = 1
-        while self._curEntry < entryCount:
-            child = self._read_nodes(fst, FSTNode.empty(), entryCount * 0xC)
-            self.add_child(child)
+            node._id = _id
+            folders[-1][0].add_child(node)
+
+            if node.is_dir():
+                folders.append((node, _size))
+
+        self._curEntry = entryCount
 
     def load_config(self, path: Path):
         if not path.is_file():
             return
 
-        with path.open("r") as f:
-            data = json.load(f)
-
-        self._init_tables(data)
+        self._init_tables(_read_json(path))
 
     def save_config(self):
         config = {
-            "alignment": self._alignmentTable,
+            "alignment": dict(self._alignmentTable),
             "location": {k: self._locationTable[k] for k in sorted(self._locationTable, key=str.upper)},
             "exclude": list(self._excludeTable)
         }
 
-        with self.configPath.open("w") as f:
-            json.dump(config, f, indent=4)
+        _write_json(self.configPath, config)
 
     def _load_from_path(self, path: Path, parentnode: FSTNode = None, ignoreList: tuple = ()):
-        for entry in sorted(path.iterdir(), key=lambda x: x.name.upper()):
-            if self.is_gcr_root() and entry.name.lower() == "&&systemdata":
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda x: x.name.upper())
+
+        for entry in entries:
+            if entry.name.lower() == "&&systemdata" and self.is_gcr_root():
                 continue
 
             disable = False
-            for badPath in ignoreList:
-                if entry.match(badPath):
-                    disable = True
+            if ignoreList:
+                entryPath = Path(entry.path)
+                disable = any(entryPath.match(badPath) for badPath in ignoreList)
 
             if entry.is_file():
                 child = FSTNode.file(
                     entry.name, parent=parentnode, size=entry.stat().st_size)
-                child._alignment = self._get_alignment(child)
-                child._position = self._get_location(child)
                 child._exclude = disable
-                child.size = entry.stat().st_size
 
             elif entry.is_dir():
                 child = FSTNode.folder(entry.name)
@@ -940,7 +1190,7 @@ class GamecubeISO(ISOBase):
                 if parentnode is not None:
                     parentnode.add_child(child)
 
-                self._load_from_path(entry, child, ignoreList=ignoreList)
+                self._load_from_path(Path(entry.path), child, ignoreList=ignoreList)
             else:
                 raise InvalidEntryError("Not a dir or file")
 
@@ -949,11 +1199,7 @@ class GamecubeISO(ISOBase):
         self._excludeTable.clear()
 
         for node in self.rchildren():
-            defaultAlignment = 4
-            for match in self._alignmentTable:
-                if fnmatch(node.path, match):
-                    defaultAlignment = self._alignmentTable[match]
-                    break
+            defaultAlignment = self._get_alignment(node)
 
             if node.is_file():
                 if node._alignment != defaultAlignment:
@@ -961,8 +1207,9 @@ class GamecubeISO(ISOBase):
                 if node._position:
                     self._locationTable[node.path] = node._position
             if node._exclude:
-                self._excludeTable.add(node.path)
+                self._excludeTable.append(node.path)
 
+        self._compile_tables()
         self.save_config()
 
 # pylint: enable=not-callable